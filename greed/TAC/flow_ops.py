@@ -14,7 +14,35 @@ log = logging.getLogger(__name__)
 This module contains the TAC statements that are related to the control flow of the program.
 """
 
-class TAC_Jump(TAC_Statement):
+class TAC_BaseJump(TAC_Statement):
+    """
+    This class represents super class for the JUMP and JUMPI TAC statements.
+    """
+    __internal_name__ = "_JUMP"
+
+    # Metadata for _JUMP statements (pc of the jump target, when the destination is a static value).
+    static_destination_pc = None
+
+    def get_destination_pc(self, state: SymbolicEVMState) -> str:
+        """
+        Resolve the pc of the jump target.
+        If the destination is a static value (from the Gigahorse IR), the result is the same for every
+        state reaching this statement, so it is resolved only once.
+        Args:
+            state: The state executing this statement
+        Returns:
+            The pc of the jump target
+        """
+        if self.static_destination_pc is not None:
+            return self.static_destination_pc
+
+        dest = state.get_non_fallthrough_pc(self.destination_val)
+        if self.raw_arg_vals[self.destination_var] is not None:
+            self.static_destination_pc = dest
+        return dest
+
+
+class TAC_Jump(TAC_BaseJump):
     """
     This class represents a JUMP TAC statement.
     """
@@ -23,64 +51,79 @@ class TAC_Jump(TAC_Statement):
 
     @TAC_Statement.handler_with_side_effects
     def handle(self, state: SymbolicEVMState):
-        state.pc = state.get_non_fallthrough_pc(self.destination_val)
+        state.pc = self.get_destination_pc(state)
         return [state]
 
 
-class TAC_Jumpi(TAC_Statement):
+class TAC_Jumpi(TAC_BaseJump):
     __internal_name__ = "JUMPI"
     __aliases__ = {'destination_var': 'arg1_var', 'destination_val': 'arg1_val',
                    'condition_var': 'arg2_var', 'condition_val': 'arg2_val'}
 
     @TAC_Statement.handler_with_side_effects
     def handle(self, state: SymbolicEVMState):
-        dest = state.get_non_fallthrough_pc(self.destination_val)
+        # NOTE: the successors are built in place on the given state, and the state is copied only if
+        # both branches are feasible. The jump target is resolved only on the paths that take the jump.
         cond = self.condition_val
-        
+
         if is_concrete(cond):
             # if the jump condition is concrete, use it to determine the jump target
             if bv_unsigned_value(cond) != 0:
-                state.pc = dest
+                state.pc = self.get_destination_pc(state)
                 return [state]
             else:
                 state.set_next_pc()
                 return [state]
         else:
-            if options.LAZY_SOLVES:
+            # build the branch conditions once, they are used both for
+            # querying the solver and as path constraints
+            cond_true = NotEqual(cond, BVV(0, 256))
+            cond_false = Equal(cond, BVV(0, 256))
+
+            if state.solver.has_path_constraint(cond_true):
+                # the same condition was already taken on this path, no need to query the solver
+                sat_true = True
+                sat_false = False
+            elif state.solver.has_path_constraint(cond_false):
+                # the negated condition was already taken on this path
+                sat_true = False
+                sat_false = True
+            elif options.LAZY_SOLVES:
                 # just collect the constraints
                 sat_true = True
                 sat_false = True
             else:
                 # let's check if both branches are sat
-                sat_true = state.solver.is_formula_sat(NotEqual(cond, BVV(0, 256)))
-                sat_false = state.solver.is_formula_sat(Equal(cond, BVV(0, 256)))
+                # (assumption-based queries on the state's own solver context,
+                # nothing is re-asserted)
+                # NOTE: the two queries are intentionally sequential: they share the same yices context
+                # (and the global yices term table), and the second one is skipped when the first is unsat
+                sat_true = state.solver.is_formula_sat(cond_true)
+                # if the true branch is unsat, the false branch is implied by the path constraints
+                # (if the state itself is unsat, it is moved to the unsat stash after the step)
+                sat_false = state.solver.is_formula_sat(cond_false) if sat_true else True
 
             if sat_true and sat_false:
                 # actually fork here
                 succ_true = state.copy()
                 succ_false = state
 
-                succ_true.pc = dest
-                succ_true.add_constraint(NotEqual(cond, BVV(0, 256)))
+                succ_true.pc = self.get_destination_pc(succ_true)
+                succ_true.add_constraint(cond_true)
 
                 succ_false.set_next_pc()
-                succ_false.add_constraint(Equal(cond, BVV(0, 256)))
+                succ_false.add_constraint(cond_false)
 
                 return [succ_true, succ_false]
             elif sat_true:
                 # if only the true branch is sat, jump
-                state.pc = dest
-                state.add_constraint(NotEqual(cond, BVV(0, 256)))
+                state.pc = self.get_destination_pc(state)
+                state.add_constraint(cond_true)
                 return [state]
-            elif sat_false:
+            else:
                 # if only the false branch is sat, step to the fallthrough branch
                 state.set_next_pc()
-                state.add_constraint(Equal(cond, BVV(0, 256)))
-                return [state]
-            else:
-                # nothing is sat
-                log.fatal(f"JUMPI with UNSAT branches at ({state.pc})")
-                state.halt = True
+                state.add_constraint(cond_false)
                 return [state]
 
 
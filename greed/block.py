@@ -44,6 +44,25 @@ class Block(object):
         self._subgraph = None
         self._acyclic_subgraph = None
 
+        # resolved jump destinations: destination value -> target block (see SymbolicEVMState.get_non_fallthrough_pc)
+        self.jump_targets = dict()
+
+        # statement id -> id of the next statement in the block (built on first use,
+        # statements can still be injected in the block while the project is being loaded)
+        self._next_statement_at = None
+
+    def next_statement_id(self, stmt_id: str) -> str:
+        """
+        Args:
+            stmt_id: Statement id
+        Returns:
+            Id of the statement following stmt_id in this block (None if stmt_id is the last statement)
+        """
+        if self._next_statement_at is None:
+            self._next_statement_at = {stmt_a.id: stmt_b.id
+                                       for stmt_a, stmt_b in zip(self.statements[:-1], self.statements[1:])}
+        return self._next_statement_at.get(stmt_id, None)
+
     @property
     def succ(self) -> List['Block']:
         """
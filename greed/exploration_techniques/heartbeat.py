@@ -36,9 +36,11 @@ class HeartBeat(ExplorationTechnique):
         self.steps_cnt += 1
         if self.beat_cnt == self.beat_interval:
             log.info("Exploration is alive <3. Step {}".format(self.steps_cnt))
-            log.info(f"Simgr: {simgr} (active: {simgr.active})")
-            if self.show_op:
-                log.info(f"State: {simgr.active[0]} (curr_stmt: {simgr.active[0].curr_stmt})")
+            # formatting the simgr walks all the stashes, skip it when nobody is listening
+            if log.isEnabledFor(logging.INFO):
+                log.info(f"Simgr: {simgr} (active: {simgr.active})")
+                if self.show_op:
+                    log.info(f"State: {simgr.active[0]} (curr_stmt: {simgr.active[0].curr_stmt})")
             self.beat_cnt = 0
             if not os.path.isfile(self.heart_beat_file):
                 log.info("HeartBeat stopped, need help? </3")
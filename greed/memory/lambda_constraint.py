@@ -20,11 +20,7 @@ class LambdaConstraint:
         self.new_array = new_array
         self.parent = parent
 
-        self.depth = 1
-        node = self.parent
-        while node is not None:
-            self.depth += 1
-            node = node.parent
+        self.depth = 1 if self.parent is None else self.parent.depth + 1
 
     def instantiate(self, index):
         """
@@ -32,15 +28,56 @@ class LambdaConstraint:
         Args:
             index: The read index
         Returns: 
-            All instantiated constraints (recursively from the LambdaConstraint hierarchy)
+            All instantiated constraints (from the LambdaConstraint hierarchy, stopping at the first layer
+            that was written at the index)
         """
-        return []
+        # walk the hierarchy iteratively, it can be arbitrarily deep
+        instances = list()
+        node = self
+        while node is not None and index not in node.following_writes:
+            instance = node.instantiate_layer(index)
+            if instance is not None:
+                instances.append(instance)
+            node = node.parent
+        return instances
+
+    def instantiate_layer(self, index):
+        """
+        Instantiate the constraint of this layer only
+        Args:
+            index: The read index
+        Returns:
+            The instantiated constraint, or None
+        """
+        return None
 
     def copy(self, new_state):
-        new_parent = None if self.parent is None else self.parent.copy(new_state=new_state)
-        new_lambda_constraint = LambdaConstraint(array=self.array, new_array=self.new_array, parent=new_parent)
+        """
+        Copy the constraint hierarchy (on state copy)
+        Args:
+            new_state: the new state
+        """
+        # copy the hierarchy bottom-up, without recursion
+        layers = list()
+        node = self
+        while node is not None:
+            layers.append(node)
+            node = node.parent
+
+        new_lambda_constraint = None
+        for node in reversed(layers):
+            new_lambda_constraint = node.copy_layer(new_state=new_state, new_parent=new_lambda_constraint)
         return new_lambda_constraint
 
+    def copy_layer(self, new_state, new_parent):
+        """
+        Copy this layer only
+        Args:
+            new_state: the new state
+            new_parent: the (already copied) parent LambdaConstraint
+        """
+        return LambdaConstraint(array=self.array, new_array=self.new_array, parent=new_parent)
+
     def __str__(self):
         return f"[{len(self.following_writes)} following writes]\n" \
                f"LambdaConstraint"
@@ -65,30 +102,27 @@ class LambdaMemsetConstraint(LambdaConstraint):
         self.value = value
         self.size = size
 
-    def instantiate(self, index):
+    def instantiate_layer(self, index):
         """
-        Instantiate the constraint (on read)
+        Instantiate the constraint of this layer (on read)
         Args:
             index: The read index
         """
-        if index in self.following_writes:
-            return []
-
         index_in_range = And(BV_ULE(self.start, index), BV_ULT(index, BV_Add(self.start, self.size)))
         instance = Equal(Array_Select(self.new_array, index),
                          If(index_in_range,
                             self.value,
                             Array_Select(self.array, index)))
 
-        return [instance] + self.parent.instantiate(index)
+        return instance
 
-    def copy(self, new_state):
+    def copy_layer(self, new_state, new_parent):
         """
-        Copy the constraint (on state copy)
+        Copy this layer (on state copy)
         Args:
             new_state: the new state
+            new_parent: the (already copied) parent LambdaConstraint
         """
-        new_parent = None if self.parent is None else self.parent.copy(new_state=new_state)
         new_lambda_constraint = LambdaMemsetConstraint(array=self.array, start=self.start, value=self.value, size=self.size,
                                                        new_array=self.new_array, parent=new_parent)
         return new_lambda_constraint
@@ -116,30 +150,27 @@ class LambdaMemsetInfiniteConstraint(LambdaConstraint):
         self.start = start
         self.value = value
 
-    def instantiate(self, index):
+    def instantiate_layer(self, index):
         """
-        Instantiate the constraint (on read)
+        Instantiate the constraint of this layer (on read)
         Args:
             index: The read index
         """
-        if index in self.following_writes:
-            return []
-
         index_in_range = BV_ULE(self.start, index)
         instance = Equal(Array_Select(self.new_array, index),
                          If(index_in_range,
                             self.value,
                             Array_Select(self.array, index)))
 
-        return [instance] + self.parent.instantiate(index)
+        return instance
 
-    def copy(self, new_state):
+    def copy_layer(self, new_state, new_parent):
         """
-        Copy the constraint (on state copy)
+        Copy this layer (on state copy)
         Args:
             new_state: the new state
+            new_parent: the (already copied) parent LambdaConstraint
         """
-        new_parent = None if self.parent is None else self.parent.copy(new_state=new_state)
         new_lambda_constraint = LambdaMemsetInfiniteConstraint(array=self.array, start=self.start, value=self.value,
                                                                new_array=self.new_array, parent=new_parent)
         return new_lambda_constraint
@@ -172,15 +203,12 @@ class LambdaMemcopyConstraint(LambdaConstraint):
         self.source_start = source_start
         self.size = size
 
-    def instantiate(self, index):
+    def instantiate_layer(self, index):
         """
-        Instantiate the constraint (on read)
+        Instantiate the constraint of this layer (on read)
         Args:
             index: The read index
         """
-        if index in self.following_writes:
-            return []
-
         index_in_range = And(BV_ULE(self.start, index), BV_ULT(index, BV_Add(self.start, self.size)))
 
         shift_to_source_offset = BV_Sub(self.source_start, self.start)
@@ -191,15 +219,15 @@ class LambdaMemcopyConstraint(LambdaConstraint):
                             self.source[BV_Add(index, shift_to_source_offset)],
                             Array_Select(self.array, index)))
 
-        return [instance] + self.parent.instantiate(index)
+        return instance
 
-    def copy(self, new_state):
+    def copy_layer(self, new_state, new_parent):
         """
-        Copy the constraint (on state copy)
+        Copy this layer (on state copy)
         Args:
             new_state: the new state
+            new_parent: the (already copied) parent LambdaConstraint
         """
-        new_parent = None if self.parent is None else self.parent.copy(new_state=new_state)
         new_source = self.source.copy(new_state=new_state)
         new_lambda_constraint = LambdaMemcopyConstraint(array=self.array, start=self.start, source=new_source,
                                                         source_start=self.source_start, size=self.size,
@@ -232,15 +260,12 @@ class LambdaMemcopyInfiniteConstraint(LambdaConstraint):
         self.source = source
         self.source_start = source_start
 
-    def instantiate(self, index):
+    def instantiate_layer(self, index):
         """
-        Instantiate the constraint (on read)
+        Instantiate the constraint of this layer (on read)
         Args:
             index: The read index
         """
-        if index in self.following_writes:
-            return []
-
         index_in_range = BV_ULE(self.start, index)
         shift_to_source_offset = BV_Sub(self.source_start, self.start)
     
@@ -250,15 +275,15 @@ class LambdaMemcopyInfiniteConstraint(LambdaConstraint):
                             self.source[BV_Add(index, shift_to_source_offset)],
                             Array_Select(self.array, index)))
 
-        return [instance] + self.parent.instantiate(index)
+        return instance
 
-    def copy(self, new_state):
+    def copy_layer(self, new_state, new_parent):
         """
-        Copy the constraint (on state copy)
+        Copy this layer (on state copy)
         Args:
             new_state: the new state
+            new_parent: the (already copied) parent LambdaConstraint
         """
-        new_parent = None if self.parent is None else self.parent.copy(new_state=new_state)
         new_source = self.source.copy(new_state=new_state)
         new_lambda_constraint = LambdaMemcopyInfiniteConstraint(array=self.array, start=self.start, source=new_source,
                                                                 source_start=self.source_start,
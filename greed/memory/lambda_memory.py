@@ -18,6 +18,9 @@ log = logging.getLogger(__name__)
 if TYPE_CHECKING:
     from greed.state import SymbolicEVMState
 
+_INDEX_SORT = BVSort(256)
+_BYTE_SORT = BVSort(8)
+
 
 class LambdaMemory:
     """
@@ -59,6 +62,10 @@ class LambdaMemory:
     uuid_generator = UUIDGenerator()
     state: "SymbolicEVMState"
 
+    # the cache is shared (copy-on-write) with the copies of this memory, until the first update:
+    # [number of memories sharing the cache], shared by all of them (None if the cache is not shared)
+    _cache_owners = None
+
     def __init__(
         self, tag=None, value_sort=None, default=None, state=None, partial_init=False
     ):
@@ -89,7 +96,7 @@ class LambdaMemory:
 
         self._base = Array(
             f"{self.tag}_{LambdaMemory.uuid_generator.next()}_{self.layer_level}",
-            BVSort(256),
+            _INDEX_SORT,
             value_sort,
         )
         if default is not None:
@@ -127,6 +134,7 @@ class LambdaMemory:
 
         # invalidate cache if range fully unspecified or fully symbolic
         if start is None and end is None:  # range fully unspecified
+            self._release_cache()
             self.cache = defaultdict(dict)
             return
         elif (
@@ -137,6 +145,7 @@ class LambdaMemory:
         ) and self.state.solver.is_formula_sat(  # range fully symbolic
             BV_ULE(start, BVV(max(self.cache[1] or [0]), 256))
         ):  # could overlap with any cache slot
+            self._release_cache()
             self.cache = defaultdict(dict)
             return
         elif (
@@ -155,12 +164,45 @@ class LambdaMemory:
             end = BVV(2**256 - 1, 256)
         start = bv_unsigned_value(start)
         end = bv_unsigned_value(end)
+        self._unshare_cache()
         for width in self.cache:
             for k in list(self.cache[width]):
                 # if there is any overlap between [k, k+width) and [start, end), invalidate
                 if any([start <= k + i < end for i in range(width)]):
                     del self.cache[width][k]
 
+    def _share_cache(self, new_memory):
+        """
+        Share the cache with a copy of this memory (copy-on-write).
+        Args:
+            new_memory: the copy of this memory
+        """
+        if self._cache_owners is None:
+            self._cache_owners = [1]
+        self._cache_owners[0] += 1
+        new_memory.cache = self.cache
+        new_memory._cache_owners = self._cache_owners
+
+    def _release_cache(self):
+        """
+        Stop sharing the cache (the caller is about to replace it or to update it in place).
+        """
+        if self._cache_owners is not None:
+            self._cache_owners[0] -= 1
+            self._cache_owners = None
+
+    def _unshare_cache(self):
+        """
+        Make a private copy of the cache (if still shared with other memories), before updating it.
+        The last owner of a shared cache updates it in place.
+        """
+        if self._cache_owners is not None and self._cache_owners[0] > 1:
+            shared_cache = self.cache
+            self.cache = defaultdict(dict)
+            for width in shared_cache:
+                self.cache[width].update(shared_cache[width])
+        self._release_cache()
+
     @property
     def layer_level(self):
         """
@@ -216,11 +258,47 @@ class LambdaMemory:
         # update cache
         self.invalidate_cache(start=index, end=BV_Add(index, BVV(1, 256)))
         if is_concrete(index):
+            self._unshare_cache()
             self.cache[1][bv_unsigned_value(index)] = v
 
         self.root_lambda_constraint.following_writes[index] = v
         self._base = Array_Store(self._base, index, v)
 
+    def bulk_store(self, writes):
+        """
+        Write to the memory at multiple concrete indices (e.g., to initialize a contiguous range).
+        Equivalent to writing the values one by one, but the cache is invalidated only once for each
+        contiguous run of indices.
+        Args:
+            writes: list of (index, value) pairs, the indices must be concrete
+        """
+        assert all(is_concrete(index) for index, _ in writes), "bulk_store with symbolic index not implemented"
+        if not writes:
+            return
+        indices = [bv_unsigned_value(index) for index, _ in writes]
+
+        # update cache (once per contiguous run, the gaps between the runs are left untouched)
+        sorted_indices = sorted(set(indices))
+        run_start = prev = sorted_indices[0]
+        for index_val in sorted_indices[1:]:
+            if index_val != prev + 1:
+                self.invalidate_cache(start=BVV(run_start, 256), end=BVV(prev + 1, 256))
+                run_start = index_val
+            prev = index_val
+        self.invalidate_cache(start=BVV(run_start, 256), end=BVV(prev + 1, 256))
+        self._unshare_cache()
+        cache = self.cache[1]
+
+        following_writes = self.root_lambda_constraint.following_writes
+        base = self._base
+        for index_val, (index, v) in zip(indices, writes):
+            cache[index_val] = v
+            following_writes[index] = v
+            base = Array_Store(base, index, v)
+        self._base = base
+
+        self.write_count += len(writes)
+
     def readn(self, index, n):
         """
         Read n bytes from the memory at a specific index.
@@ -276,6 +354,7 @@ class LambdaMemory:
         # update cache
         if is_concrete(index):
             # print(f"caching writen {bv_unsigned_value(index)}:{bv_unsigned_value(n)} = {v}")
+            self._unshare_cache()
             self.cache[bv_unsigned_value(n)][bv_unsigned_value(index)] = v
 
     def memset(self, start, value, size):
@@ -289,8 +368,8 @@ class LambdaMemory:
         old_base = self._base
         self._base = Array(
             f"{self.tag}_{LambdaMemory.uuid_generator.next()}_{self.layer_level}",
-            BVSort(256),
-            BVSort(8),
+            _INDEX_SORT,
+            _BYTE_SORT,
         )
 
         # update cache
@@ -310,8 +389,8 @@ class LambdaMemory:
         old_base = self._base
         self._base = Array(
             f"{self.tag}_{LambdaMemory.uuid_generator.next()}_{self.layer_level}",
-            BVSort(256),
-            BVSort(8),
+            _INDEX_SORT,
+            _BYTE_SORT,
         )
 
         # update cache
@@ -336,8 +415,8 @@ class LambdaMemory:
         old_base = self._base
         self._base = Array(
             f"{self.tag}_{LambdaMemory.uuid_generator.next()}_{self.layer_level}",
-            BVSort(256),
-            BVSort(8),
+            _INDEX_SORT,
+            _BYTE_SORT,
         )
 
         # update cache
@@ -367,8 +446,8 @@ class LambdaMemory:
         old_base = self._base
         self._base = Array(
             f"{self.tag}_{LambdaMemory.uuid_generator.next()}_{self.layer_level}",
-            BVSort(256),
-            BVSort(8),
+            _INDEX_SORT,
+            _BYTE_SORT,
         )
 
         # update cache
@@ -399,9 +478,7 @@ class LambdaMemory:
             new_state=new_state
         )
         new_memory._constraints = list(self._constraints)
-        new_memory.cache = defaultdict(dict)
-        for width in self.cache:
-            new_memory.cache[width].update(self.cache[width])
+        self._share_cache(new_memory)
         new_memory.write_count = self.write_count
         new_memory.read_count = self.read_count
 
@@ -33,6 +33,16 @@ MIN_SHA_DISTANCE = 2**20
 # Create a graph visualizing the exploration.
 SIMGRVIZ = False
 
+# Default search strategy of the simulation manager,
+# used only as long as no exploration technique is plugged.
+# With DFS, only one state is kept active (the others are parked
+# in the 'deferred' stash), which bounds the number of live states
+# (and solver contexts).
+SEARCH_STRATEGY_BFS = "BFS"
+SEARCH_STRATEGY_DFS = "DFS"
+# Default is BFS
+DEFAULT_SEARCH_STRATEGY = SEARCH_STRATEGY_BFS
+
 # Activate debugging capabilities through the
 # SimStateInspect plugin (i.e., breakpoints)
 STATE_INSPECT = False
@@ -150,7 +150,7 @@ class Project(object):
             #label = []
             #label.append(f"func[{func.id}]: {func.signature}")
             #label = "\n".join(label)
-            if func.signature != None:
+            if func.signature is not None:
                 dot += f"\"{func.id}\" [shape=box, color={color}, \nlabel=\"{func.signature}\"];\n\n"
             else:
                 dot += f"\"{func.id}\" [shape=box, color={color}]"
@@ -110,7 +110,6 @@ class Sha3(LambdaMemory):
 
         new_sha_memory.is_concrete = self.is_concrete
 
-        for width in self.cache:
-            new_sha_memory.cache[width].update(self.cache[width])
+        self._share_cache(new_sha_memory)
 
         return new_sha_memory
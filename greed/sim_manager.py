@@ -1,7 +1,8 @@
+import itertools
 import logging
 import os
 import sys
-from typing import Callable, List, Optional, TYPE_CHECKING, TypedDict
+from typing import Callable, Dict, List, Optional, TYPE_CHECKING, TypedDict
 
 from greed import options
 from greed.state import SymbolicEVMState
@@ -22,6 +23,19 @@ if TYPE_CHECKING:
 log = logging.getLogger(__name__)
 
 
+# default predicates (module-level, so that step() can recognize them and skip the calls)
+def _always(s: SymbolicEVMState) -> bool:
+    return True
+
+
+def _never(s: SymbolicEVMState) -> bool:
+    return False
+
+
+def _is_unsat(s: SymbolicEVMState) -> bool:
+    return not s.solver.is_sat()
+
+
 class SimulationManager:
     """
     This class is the main class for running the symbolic execution.
@@ -29,9 +43,17 @@ class SimulationManager:
     and for moving them between the different stashes according to the employed
     exploration techniques.
     """
+    __slots__ = ('project', '_techniques', '_default_search', '_check_stashes_fns', '_check_state_fns',
+                 '_check_successors_fns', 'stashes', '_disposed_marks', 'insns_count', 'error')
+
     project: "Project"
     _techniques: List["ExplorationTechnique"]
+    _default_search: Optional["ExplorationTechnique"]
+    _check_stashes_fns: List[Callable]
+    _check_state_fns: List[Callable]
+    _check_successors_fns: List[Callable]
     stashes: "_STASHES_TYPE"
+    _disposed_marks: Dict[str, int]
     insns_count: int
     error: List[str]
 
@@ -43,6 +65,13 @@ class SimulationManager:
         """
         self.project = project
         self._techniques = []
+        # the technique implementing options.DEFAULT_SEARCH_STRATEGY (if any), created on the first step
+        self._default_search = None
+
+        # technique hooks, bound once when the technique is installed
+        self._check_stashes_fns = []
+        self._check_state_fns = []
+        self._check_successors_fns = []
 
         # initialize empty stashes
         self.stashes = {
@@ -54,6 +83,9 @@ class SimulationManager:
             'errored': []
         }
 
+        # how many states of the stashes of dead states have already been disposed
+        self._disposed_marks = {'pruned': 0, 'unsat': 0, 'errored': 0}
+
         self.insns_count = 0
         self.error = list()
 
@@ -72,7 +104,7 @@ class SimulationManager:
         Returns:
             All the states in the simulation manager
         """
-        return sum(self.stashes.values(), [])
+        return list(itertools.chain.from_iterable(self.stashes.values()))
 
     @property
     def active(self) -> List[SymbolicEVMState]:
@@ -104,10 +136,8 @@ class SimulationManager:
         Returns:
             First element of the active stash, or None if the stash is empty
         """
-        if len(self.stashes['active']) > 0:
-            return self.stashes['active'][0]
-        else:
-            return None
+        active = self.stashes['active']
+        return active[0] if active else None
 
     @property
     def one_deadended(self) -> Optional[SymbolicEVMState]:
@@ -115,10 +145,8 @@ class SimulationManager:
         Returns:
             First element of the deadended stash, or None if the stash is empty
         """
-        if len(self.stashes['deadended']) > 0:
-            return self.stashes['deadended'][0]
-        else:
-            return None
+        deadended = self.stashes['deadended']
+        return deadended[0] if deadended else None
 
     @property
     def one_found(self) -> Optional[SymbolicEVMState]:
@@ -126,21 +154,52 @@ class SimulationManager:
         Returns:
             First element of the found stash, or None if the stash is empty
         """
-        if len(self.stashes['found']) > 0:
-            return self.stashes['found'][0]
-        else:
-            return None
+        found = self.stashes['found']
+        return found[0] if found else None
 
     def use_technique(self, technique: "ExplorationTechnique"):
         """
         Install an exploration technique in the simulation manager.
         """
+        if self._default_search is not None:
+            # the plugged techniques drive the exploration from now on,
+            # give back the states parked by the default search
+            self.move(from_stash=self._default_search.deferred_stash, to_stash='active')
+            self._default_search = None
+
         technique.project = self.project
         technique.setup(self)
         self._techniques.append(technique)
+        self._check_stashes_fns.append(technique.check_stashes)
+        self._check_state_fns.append(technique.check_state)
+        self._check_successors_fns.append(technique.check_successors)
         return technique
 
-    def move(self, from_stash: str, to_stash: str, filter_func: Callable[[SymbolicEVMState], bool] = lambda s: True):
+    def _get_default_search(self) -> Optional["ExplorationTechnique"]:
+        """
+        Returns:
+            The technique implementing options.DEFAULT_SEARCH_STRATEGY, or None if no technique is needed
+            (BFS) or if some ET are plugged (they drive the exploration)
+        """
+        if self._techniques or options.DEFAULT_SEARCH_STRATEGY != options.SEARCH_STRATEGY_DFS:
+            return None
+        if self._default_search is None:
+            from greed.exploration_techniques import DFS
+            self._default_search = DFS()
+            self._default_search.project = self.project
+            self._default_search.setup(self)
+        return self._default_search
+
+    def _is_complete(self) -> bool:
+        """
+        Returns:
+            True if the plugged ET (or the default search) are done
+        """
+        if self._techniques:
+            return all(t.is_complete(self) for t in self._techniques)
+        return self._default_search is None or self._default_search.is_complete(self)
+
+    def move(self, from_stash: str, to_stash: str, filter_func: Callable[[SymbolicEVMState], bool] = _always):
         """
         Move all the states that meet the filter_func condition from from_stash to to_stash
         Args:
@@ -148,13 +207,22 @@ class SimulationManager:
             to_stash: Destination Stash
             filter_func: A function that discriminates what states should be moved
         """
-        for s in list(self.stashes[from_stash]):
+        # partition the source stash in a single pass (the stash is updated in place)
+        from_states = self.stashes[from_stash]
+        keep = list()
+        moved = list()
+        for s in from_states:
             if filter_func(s):
-                self.stashes[from_stash].remove(s)
-                self.stashes[to_stash].append(s)
+                moved.append(s)
+            else:
+                keep.append(s)
 
-    def step(self, find: Callable[[SymbolicEVMState], bool] = lambda s: False,
-                   prune: Callable[[SymbolicEVMState], bool] = lambda s: False):
+        if moved:
+            from_states[:] = keep
+            self.stashes[to_stash].extend(moved)
+
+    def step(self, find: Callable[[SymbolicEVMState], bool] = _never,
+                   prune: Callable[[SymbolicEVMState], bool] = _never):
         """
         Step the simulation manager, i.e., step all the active states.
         Args:
@@ -163,36 +231,69 @@ class SimulationManager:
         """
         log.debug('-' * 30)
         new_active = list()
+
         # Let the techniques manipulate the stashes
-        for tech in self._techniques:
-            self.stashes = tech.check_stashes(self, self.stashes)
+        for check_stashes in self._check_stashes_fns:
+            self.stashes = check_stashes(self, self.stashes)
+
+        # No techniques, apply the default search strategy
+        default_search = self._get_default_search()
+        if default_search is not None:
+            self.stashes = default_search.check_stashes(self, self.stashes)
 
         # Let's step the active!
+        # NOTE: states are stepped sequentially on purpose: they share the statements/blocks of the project,
+        # the Yices term table is global, and the ET hooks mutate the simgr, so this loop is not thread-safe
+        add_successors = new_active.extend
+        single_step_state = self.single_step_state
         for state in self.active:
             try:
-                successors = self.single_step_state(state)
+                add_successors(single_step_state(state))
             except Exception as e:
                 log.exception(f"Something went wrong while generating successor for {state}")
                 state.error = e
                 state.halt = True
-                successors = [state]
-            new_active += successors
-
-        self.stashes['active'] = new_active
+                new_active.append(state)
 
         self.insns_count += 1
 
-        self.move(from_stash='active', to_stash='found', filter_func=find)
-        self.move(from_stash='active', to_stash='errored', filter_func=lambda s: s.error != None)
-        self.move(from_stash='active', to_stash='deadended', filter_func=lambda s: s.halt)
-        self.move(from_stash='active', to_stash='pruned', filter_func=prune)
-
-        if not options.LAZY_SOLVES:
-            self.move(from_stash='active', to_stash='unsat', filter_func=lambda s: not s.solver.is_sat())
-        self.move(from_stash='found', to_stash='unsat', filter_func=lambda s: not s.solver.is_sat())
-
-        for s in self.stashes['pruned'] + self.stashes['unsat'] + self.stashes['errored']:
-            s.solver.dispose_context()
+        # Classify the successors in a single pass
+        # (found > errored > deadended > pruned > unsat > active)
+        lazy_solves = options.LAZY_SOLVES
+        has_find = find is not _never
+        has_prune = prune is not _never
+        active, found, errored, deadended, pruned, unsat = [], [], [], [], [], []
+        for s in new_active:
+            if has_find and find(s):
+                found.append(s)
+            elif s.error is not None:
+                errored.append(s)
+            elif s.halt:
+                deadended.append(s)
+            elif has_prune and prune(s):
+                pruned.append(s)
+            elif not lazy_solves and not s.solver.is_sat():
+                unsat.append(s)
+            else:
+                active.append(s)
+
+        self.stashes['active'] = active
+        self.stashes['found'].extend(found)
+        self.stashes['errored'].extend(errored)
+        self.stashes['deadended'].extend(deadended)
+        self.stashes['pruned'].extend(pruned)
+        self.stashes['unsat'].extend(unsat)
+
+        self.move(from_stash='found', to_stash='unsat', filter_func=_is_unsat)
+
+        # dispose the solver contexts of the dead states added since the last step
+        # (including the ones added outside of step(), e.g., between two runs)
+        marks = self._disposed_marks
+        for stash, mark in marks.items():
+            dead_states = self.stashes[stash]
+            for s in dead_states[min(len(dead_states), mark):]:
+                s.solver.dispose_context()
+            marks[stash] = len(dead_states)
 
     def single_step_state(self, state: SymbolicEVMState) -> List[SymbolicEVMState]:
         """
@@ -204,48 +305,53 @@ class SimulationManager:
         Raises:
             Exception: If something goes wrong while generating the successors
         """
-        log.debug(f"Stepping {state}")
-        log.debug(state.curr_stmt)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Stepping %s", state)
+            log.debug(state.curr_stmt)
 
         # Some inspect capabilities, uses the plugin.
-        if hasattr(state, "inspect"):
+        inspect = getattr(state, "inspect", None)
+        if inspect is not None:
             # Trigger breakpoints on specific stmt_id
-            if state.pc in state.inspect.breakpoints_stmt_ids.keys():
-                state.inspect.breakpoints_stmt_ids[state.pc](self, state)
+            breakpoint_func = inspect.breakpoints_stmt_ids.get(state.pc, None)
+            if breakpoint_func is not None:
+                breakpoint_func(self, state)
             # Trigger breakpoints on all the stmt with that name
-            if state.curr_stmt.__internal_name__ in state.inspect.breakpoints_stmt.keys():
-                state.inspect.breakpoints_stmt[state.curr_stmt.__internal_name__](self, state)
+            # (the breakpoint above might have moved the state, re-fetch the statement)
+            breakpoint_func = inspect.breakpoints_stmt.get(state.curr_stmt.__internal_name__, None)
+            if breakpoint_func is not None:
+                breakpoint_func(self, state)
         successors = list()
 
         # Let exploration techniques manipulate the state
         # that is going to be handled
         state_to_step = state
-        for t in self._techniques:
-            state_to_step = t.check_state(self, state_to_step)
+        for check_state in self._check_state_fns:
+            state_to_step = check_state(self, state_to_step)
 
         # Finally step the state
         try:
-            successors += state.curr_stmt.handle(state)
+            successors.extend(state.curr_stmt.handle(state))
         except Exception as e:
             log.exception(f"Something went wrong while generating successor for {state}")
             state.error = e
             state.halt = True
-            successors += [state]
+            successors.append(state)
 
         # Let exploration techniques manipulate the successors
-        for t in self._techniques:
-            successors = t.check_successors(self, successors)
+        for check_successors in self._check_successors_fns:
+            successors = check_successors(self, successors)
 
         return successors
 
-    def run(self, find: Callable[[SymbolicEVMState], bool] = lambda s: False,
-            prune: Callable[[SymbolicEVMState], bool] = lambda s: False,
+    def run(self, find: Callable[[SymbolicEVMState], bool] = _never,
+            prune: Callable[[SymbolicEVMState], bool] = _never,
             find_all=False):
         """
         Run the simulation manager, until the `find` condition is met.
         The analysis will stop when there are no more active states, some states met the `find` condition
         (these will be moved to the found stash), or the exploration techniques are done.
-        If no ET are plugged, the default searching strategy is BFS.
+        If no ET are plugged, the default searching strategy is BFS (see options.DEFAULT_SEARCH_STRATEGY).
         When techniques are plugged, their methods are executed following the same order they were plugged.
 
         e.g., assuming we have T1 and T2.
@@ -261,11 +367,11 @@ class SimulationManager:
         """
         try:
             # We iterate until we have active states,
-            # OR, if any of the ET is not done.
-            while len(self.active) > 0 or (self._techniques != [] and
-                                            not(all([t.is_complete(self) for t in self._techniques]))):
+            # OR, if any of the ET (or the default search) is not done.
+            # NOTE: the stashes are re-read at every iteration, step() (and the ET) replace them
+            while self.active or not self._is_complete():
 
-                if len(self.found) > 0 and not find_all:
+                if self.found and not find_all:
                     break
 
                 self.step(find, prune)
@@ -278,8 +384,8 @@ class SimulationManager:
             self.set_error(f'{exc_type.__name__} at {fname}:{exc_tb.tb_lineno}')
             sys.exit(1)
 
-    def findall(self, find: Callable[[SymbolicEVMState], bool] = lambda s: False,
-            prune: Callable[[SymbolicEVMState], bool] = lambda s: False):
+    def findall(self, find: Callable[[SymbolicEVMState], bool] = _never,
+            prune: Callable[[SymbolicEVMState], bool] = _never):
         """
         Run the simulation manager, until the `find` condition of all the ET is met.
         Args:
@@ -291,7 +397,7 @@ class SimulationManager:
             Exception: If something goes wrong while stepping the simulation manager
         """
         try:
-            while len(self.active) > 0 or (self._techniques != [] and not(all([t.is_complete(self) for t in self._techniques]))):
+            while self.active or not self._is_complete():
                 self.step(find, prune)
 
                 for found in self.found:
@@ -310,9 +416,14 @@ class SimulationManager:
     def __str__(self):
         stashes_str = [f'{len(stash)} {stash_name}'  # {[s for s in stash]}'
                        for stash_name, stash in self.stashes.items() if len(stash)]
-        errored_count = len([s for s in self.states if s.error])
+        errored_count = 0
+        reverted_count = 0
+        for s in itertools.chain.from_iterable(self.stashes.values()):
+            if s.error:
+                errored_count += 1
+            if s.revert:
+                reverted_count += 1
         stashes_str += [f'({errored_count} errored)']
-        reverted_count = len([s for s in self.states if s.revert])
         stashes_str += [f'({reverted_count} reverted)']
         return f'<SimulationManager[{self.insns_count}] with {", ".join(stashes_str)}>'
 
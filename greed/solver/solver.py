@@ -67,8 +67,11 @@ class Solver:
 
         def wrap(self, *args, **kwargs):
             # Start a timer to stop solving if the solver takes too long
-            timer = threading.Timer(options.SOLVER_TIMEOUT, raise_solver_timeout, [self])
-            timer.start()
+            # (no timer at all when no timeout is set)
+            timer = None
+            if options.SOLVER_TIMEOUT is not None:
+                timer = threading.Timer(options.SOLVER_TIMEOUT, raise_solver_timeout, [self])
+                timer.start()
 
             # Create a method to communicate the result of a function back to the main thread
             func_result = queue.Queue()
@@ -80,6 +83,7 @@ class Solver:
                     func_exc.put(e)
 
             # Launch the solving as a side thread
+            # (even without a timeout: waiting in join() keeps the query interruptible with Ctrl-C)
             func_thread = threading.Thread(target=wrapped_func, daemon=True)
             func_thread.start()
 
@@ -90,7 +94,8 @@ class Solver:
                 self.solver.stop_search()
                 raise
             finally:
-                timer.cancel()
+                if timer is not None:
+                    timer.cancel()
 
             # Handle the result of the function
             if self.timed_out:
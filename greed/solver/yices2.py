@@ -31,10 +31,14 @@ class Yices2(Solver):
 
     _assertions_by_frame: List[List["YicesTermBool"]]
 
+    # the configuration is only read when a context is created, so it is shared by all the contexts
+    _config: Optional[yices.Config] = None
+
     def __init__(self):
-        cfg = yices.Config()
-        cfg.default_config_for_logic("QF_ABV")
-        self.solver = yices.Context(cfg)
+        if Yices2._config is None:
+            Yices2._config = yices.Config()
+            Yices2._config.default_config_for_logic("QF_ABV")
+        self.solver = yices.Context(Yices2._config)
         self.timed_out = False
         self._assertions_by_frame = [[]]
 
@@ -145,8 +149,17 @@ class Yices2(Solver):
         self.solver.assert_formula(formula.id)
 
     def add_assertions(self, formulas: List["YicesTermBool"]):
+        formulas = list(formulas)
+        if not formulas:
+            return
         for f in formulas:
-            self.add_assertion(f)
+            assert isinstance(
+                f, YicesTermBool
+            ), f"Expected type YicesTermBool, got {type(f)}"
+
+        # add the assertions to the current frame (in a single call to the backend)
+        self._assertions_by_frame[-1].extend(formulas)
+        self.solver.assert_formulas([f.id for f in formulas])
 
     def Array(
         self, symbol, index_sort: "YicesTypeBV", value_sort: "YicesTypeBV"
@@ -1,5 +1,7 @@
 import datetime
+import functools
 import logging
+import re
 import typing
 
 from greed import options as opt
@@ -17,6 +19,23 @@ if typing.TYPE_CHECKING:
     from greed.TAC.base import TAC_Statement
 
 
+# sorts and constants used for every new state
+_BV8_SORT = BVSort(8)
+_BV256_SORT = BVSort(256)
+_ZERO_BYTE = BVV(0, 8)
+
+
+# interned constants used to initialize the CALLDATA (terms are immutable, so they can be shared by all states)
+@functools.lru_cache(maxsize=65536)
+def _bvv256(value: int):
+    return BVV(value, 256)
+
+
+@functools.lru_cache(maxsize=256)
+def _bvv8(value: int):
+    return BVV(value, 8)
+
+
 class SymbolicEVMState:
     """
     This class represents a symbolic EVM state (SimState).
@@ -64,7 +83,7 @@ class SymbolicEVMState:
         self._register_default_plugins()
         self._pc = None
         self.trace = list()
-        self.memory = LambdaMemory(tag=f"MEMORY_{self.xid}", value_sort=BVSort(8), default=BVV(0, 8), state=self)
+        self.memory = LambdaMemory(tag=f"MEMORY_{self.xid}", value_sort=_BV8_SORT, default=_ZERO_BYTE, state=self)
 
         # We want every state to have an individual set
         # of options.
@@ -96,10 +115,10 @@ class SymbolicEVMState:
 
         if not partial_concrete_storage:
             # Fully symbolic storage
-            self.storage = LambdaMemory(tag=f"STORAGE_{self.xid}", value_sort=BVSort(256), state=self)
+            self.storage = LambdaMemory(tag=f"STORAGE_{self.xid}", value_sort=_BV256_SORT, state=self)
         else:
             log.debug("Using PartialConcreteStorage")
-            self.storage = PartialConcreteStorage(tag=f"PCONCR_STORAGE_{self.xid}", value_sort=BVSort(256), state=self)
+            self.storage = PartialConcreteStorage(tag=f"PCONCR_STORAGE_{self.xid}", value_sort=_BV256_SORT, state=self)
 
     def set_init_ctx(self, init_ctx=None):
         """
@@ -109,6 +128,9 @@ class SymbolicEVMState:
         """
         init_ctx = init_ctx or dict()
 
+        # constraints are collected and added to the solver all at once
+        init_constraints = list()
+
         if "CALLDATASIZE" in init_ctx:
             self.calldatasize = BVV(init_ctx["CALLDATASIZE"], 256)
 
@@ -116,37 +138,49 @@ class SymbolicEVMState:
             self.MAX_CALLDATA_SIZE = init_ctx["CALLDATASIZE"]
         else:
             self.calldatasize = BVS(f'CALLDATASIZE_{self.xid}', 256)
-            self.add_constraint(BV_ULE(self.calldatasize, BVV(self.MAX_CALLDATA_SIZE, 256)))
+            init_constraints.append(BV_ULE(self.calldatasize, BVV(self.MAX_CALLDATA_SIZE, 256)))
 
         if "CALLDATA" in init_ctx:
             # We want to give the possibility to specify interleaving of symbolic/concrete data bytes in the CALLDATA.
             # for instance: "CALLDATA" = ["0x1546138954SSSS81923899"]. There are 2 symbolic bytes represented by SSSS.
             assert isinstance(init_ctx['CALLDATA'], str), "Wrong type for CALLDATA initial context"
 
-            # Parse the CALLDATA (divide the input string byte by byte)
+            # Parse the CALLDATA: first find the symbolic bytes (the SS pairs that are aligned to a byte),
+            # then parse the rest as a (concrete) hex string, with the symbolic bytes set to 00
             calldata_raw = init_ctx['CALLDATA'].replace("0x", '')
-            calldata_bytes = [calldata_raw[i:i + 2] for i in range(0, len(calldata_raw), 2)]
+            symbolic_offsets = [m.start() for m in re.finditer(r'(?=SS)', calldata_raw) if m.start() % 2 == 0]
+
+            concrete_chunks = list()
+            prev_offset = 0
+            for offset in symbolic_offsets:
+                concrete_chunks.append(calldata_raw[prev_offset:offset])
+                concrete_chunks.append('00')
+                prev_offset = offset + 2
+            concrete_chunks.append(calldata_raw[prev_offset:])
+            calldata_hex = ''.join(concrete_chunks)
+            if len(calldata_hex) % 2 != 0:
+                # a trailing nibble is a byte on its own
+                calldata_hex = calldata_hex[:-1] + '0' + calldata_hex[-1]
+            calldata_bytes = bytes.fromhex(calldata_hex)
 
             if "CALLDATASIZE" in init_ctx:
-                self.calldata = LambdaMemory(tag=f"CALLDATA_{self.xid}", value_sort=BVSort(8), state=self)
+                self.calldata = LambdaMemory(tag=f"CALLDATA_{self.xid}", value_sort=_BV8_SORT, state=self)
 
                 assert init_ctx["CALLDATASIZE"] >= len(calldata_bytes), "CALLDATASIZE is smaller than len(CALLDATA)"
             else:
-                self.calldata = LambdaMemory(tag=f"CALLDATA_{self.xid}", value_sort=BVSort(8), state=self)
+                self.calldata = LambdaMemory(tag=f"CALLDATA_{self.xid}", value_sort=_BV8_SORT, state=self)
 
                 # CALLDATASIZE is >= than the length of the provided CALLDATA bytes
-                self.add_constraint(BV_UGE(self.calldatasize, BVV(len(calldata_bytes), 256)))
-
-            for index, cb in enumerate(calldata_bytes):
-                if cb == 'SS':
-                    # special sequence for symbolic bytes
-                    # log.debug(f"Storing symbolic byte at index {index} in CALLDATA")
-                    self.calldata[BVV(index, 256)] = BVS(f'CALLDATA_BYTE_{index}', 8)
-                else:
-                    # log.debug("Initializing CALLDATA at {}".format(index))
-                    self.calldata[BVV(index, 256)] = BVV(int(cb, 16), 8)
+                init_constraints.append(BV_UGE(self.calldatasize, BVV(len(calldata_bytes), 256)))
+
+            calldata_writes = [(_bvv256(index), _bvv8(cb)) for index, cb in enumerate(calldata_bytes)]
+            for offset in symbolic_offsets:
+                # special sequence for symbolic bytes
+                index = offset // 2
+                calldata_writes[index] = (_bvv256(index), BVS(f'CALLDATA_BYTE_{index}', 8))
+            self.calldata.bulk_store(calldata_writes)
         else:
-            self.calldata = LambdaMemory(tag=f"CALLDATA_{self.xid}", value_sort=BVSort(8), state=self)
+            self.calldata = LambdaMemory(tag=f"CALLDATA_{self.xid}", value_sort=_BV8_SORT, state=self)
 
         # make calldata read bvv(0) if reading past calldatasize
         # NOTE: too slow when symbolic, for now approximate with MAX_CALLDATA_SIZE
@@ -163,7 +197,7 @@ class SymbolicEVMState:
         
         if "BALANCE" in init_ctx:
             assert isinstance(init_ctx['BALANCE'], int), "Wrong type for BALANCE initial context"
-            self.add_constraint(Equal(self.start_balance, BVV(init_ctx['BALANCE'], 256)))
+            init_constraints.append(Equal(self.start_balance, BVV(init_ctx['BALANCE'], 256)))
         
         if "ADDRESS" in init_ctx:
             assert isinstance(init_ctx['ADDRESS'], str), "Wrong type for ADDRESS initial context"
@@ -185,6 +219,9 @@ class SymbolicEVMState:
             assert isinstance(init_ctx['CALLVALUE'], int), "Wrong type for CALLVALUE initial context"
             self.ctx["CALLVALUE"] = BVV(init_ctx["CALLVALUE"], 256)
 
+        if init_constraints:
+            self.add_constraints(init_constraints)
+
     @property
     def pc(self) -> str:
         return self._pc
@@ -195,6 +232,7 @@ class SymbolicEVMState:
 
     @property
     def constraints(self):
+        # NOTE: this is a copy of the current constraints, use add_constraint(s) to add new constraints
         return self.solver.constraints
 
     @pc.setter
@@ -209,11 +247,11 @@ class SymbolicEVMState:
             VMUnexpectedSuccessors: If the successor does not match any of the expected successors
         """
         try:
-            curr_bb = self.project.factory.block(self.curr_stmt.block_id)
-            stmt_list_idx = curr_bb.statements.index(self.curr_stmt)
-            remaining_stmts = curr_bb.statements[stmt_list_idx + 1:]
-            if remaining_stmts:
-                self.pc = remaining_stmts[0].id
+            curr_stmt = self.curr_stmt
+            curr_bb = self.project.factory.block(curr_stmt.block_id)
+            next_stmt_id = curr_bb.next_statement_id(curr_stmt.id)
+            if next_stmt_id is not None:
+                self.pc = next_stmt_id
             else:
                 self.pc = self.get_fallthrough_pc()
         except VMNoSuccessors:
@@ -233,14 +271,14 @@ class SymbolicEVMState:
             raise VMNoSuccessors
         elif len(curr_bb.succ) == 1:
             #  case 2: end of the block and one target
-            log.debug("Next stmt is {}".format(curr_bb.succ[0].first_ins.id))
+            log.debug("Next stmt is %s", curr_bb.succ[0].first_ins.id)
             return curr_bb.succ[0].first_ins.id
         elif curr_bb.fallthrough_edge is None:
             raise VMNoSuccessors(f"Block {curr_bb} does not have a fallthrough edge.")
         else:
             #  case 3: end of the block and more than one target
             fallthrough_bb = curr_bb.fallthrough_edge
-            log.debug("Next stmt is {}".format(fallthrough_bb.first_ins.id))
+            log.debug("Next stmt is %s", fallthrough_bb.first_ins.id)
             return fallthrough_bb.first_ins.id
 
     def get_non_fallthrough_pc(self, destination_val):
@@ -252,20 +290,26 @@ class SymbolicEVMState:
         if not is_concrete(destination_val):
             raise VMSymbolicError(f'Symbolic jump destination currently not supported. ({destination_val=})')
         else:
-            destination_val = hex(bv_unsigned_value(destination_val))
+            destination_val = bv_unsigned_value(destination_val)
 
-        # translation using TAC_OriginalStatement_Block
-        candidate_destination_vals = self.project.tac_parser.statement_to_blocks_map[destination_val] + [destination_val]
-        candidate_bbs = [bb for bb in curr_bb.succ if (bb.id in candidate_destination_vals) or ("0x"+bb.id.split("0x")[1] in candidate_destination_vals)]
+        # the jump target only depends on the block and the destination, resolve it once
+        non_fallthrough_bb = curr_bb.jump_targets.get(destination_val, None)
+        if non_fallthrough_bb is None:
+            destination_hex = hex(destination_val)
 
-        if len(candidate_bbs) == 0:
-            raise VMSymbolicError(f'Unable to find jump destination. ({candidate_destination_vals=}, {curr_bb.succ=})')
-        elif len(candidate_bbs) > 1:
-            raise VMSymbolicError(f'Multiple jump destinations. ({candidate_destination_vals=}, {curr_bb.succ=})')
+            # translation using TAC_OriginalStatement_Block
+            candidate_destination_vals = self.project.tac_parser.statement_to_blocks_map[destination_hex] + [destination_hex]
+            candidate_bbs = [bb for bb in curr_bb.succ if (bb.id in candidate_destination_vals) or ("0x"+bb.id.split("0x")[1] in candidate_destination_vals)]
 
-        non_fallthrough_bb = candidate_bbs[0]
+            if len(candidate_bbs) == 0:
+                raise VMSymbolicError(f'Unable to find jump destination. ({candidate_destination_vals=}, {curr_bb.succ=})')
+            elif len(candidate_bbs) > 1:
+                raise VMSymbolicError(f'Multiple jump destinations. ({candidate_destination_vals=}, {curr_bb.succ=})')
 
-        log.debug("Next stmt is {}".format(non_fallthrough_bb.first_ins.id))
+            non_fallthrough_bb = candidate_bbs[0]
+            curr_bb.jump_targets[destination_val] = non_fallthrough_bb
+
+        log.debug("Next stmt is %s", non_fallthrough_bb.first_ins.id)
         return non_fallthrough_bb.first_ins.id
     
     def add_constraint(self, constraint):
@@ -277,6 +321,15 @@ class SymbolicEVMState:
             import ipdb; ipdb.set_trace()
         self.solver.add_path_constraint(constraint)
 
+    def add_constraints(self, constraints):
+        """
+        This method adds multiple constraints to the state.
+        """
+        # Here you can inspect the constraints being added to the state.
+        if opt.STATE_STOP_AT_ADDCONSTRAINT in self.options:
+            import ipdb; ipdb.set_trace()
+        self.solver.add_path_constraints(constraints)
+
     # Add here any default plugin that we want to ship
     # with a fresh state.
     def _register_default_plugins(self):
@@ -316,7 +369,7 @@ class SymbolicEVMState:
         new_state.storage = self.storage.copy(new_state=new_state)
         new_state.registers = dict(self.registers)
         new_state.ctx = dict(self.ctx)
-        new_state.options = list(self.options)
+        new_state.options = dict(self.options)
         new_state.callstack = list(self.callstack)
         new_state.returndata = dict(self.returndata)
         new_state.instruction_count = self.instruction_count
@@ -354,7 +407,7 @@ class SymbolicEVMState:
 
         self._pc = None
         self.trace = list()
-        self.memory = LambdaMemory(tag=f"MEMORY_{self.xid}", value_sort=BVSort(8), default=BVV(0, 8), state=self)
+        self.memory = LambdaMemory(tag=f"MEMORY_{self.xid}", value_sort=_BV8_SORT, default=_ZERO_BYTE, state=self)
         self.registers = dict()
         self.ctx = dict()  # todo: is it okay to reset this between transactions??
 
@@ -22,6 +22,8 @@ class SimStateSolver(SimStatePlugin):
     _curr_frame_level: int
     _path_constraints: Dict[int, Set[BoolTerm]]
     _memory_constraints: Dict[int, Set[BoolTerm]]
+    _sat_cache: Dict[BoolTerm, bool]
+    _is_sat: Optional[bool]
 
     def __init__(self, partial_init=False):
         super(SimStateSolver, self).__init__()
@@ -49,12 +51,25 @@ class SimStateSolver(SimStatePlugin):
         self._path_constraints[0] = set()
         self._memory_constraints[0] = set()
 
+        # Results of is_sat/is_formula_sat for the current set of assertions
+        # (invalidated every time the assertions change)
+        self._sat_cache = dict()
+        self._is_sat = None
+
+    def _invalidate_sat_cache(self):
+        """
+        Forget the cached satisfiability results (the assertions changed)
+        """
+        self._sat_cache.clear()
+        self._is_sat = None
+
     def _add_assertion(self, assertion: BoolTerm):
         """
         Adding the constraint to the backend
         Args:
             assertion: The constraint to add.
         """
+        self._invalidate_sat_cache()
         self._solver.add_assertion(assertion)
 
     def _add_assertions(self, assertions: List[BoolTerm]):
@@ -63,6 +78,7 @@ class SimStateSolver(SimStatePlugin):
         Args:
             assertions: The constraints to add.
         """
+        self._invalidate_sat_cache()
         self._solver.add_assertions(assertions)
 
     def push(self) -> int:
@@ -72,6 +88,7 @@ class SimStateSolver(SimStatePlugin):
         self._curr_frame_level += 1
         self._path_constraints[self._curr_frame_level] = set()
         self._memory_constraints[self._curr_frame_level] = set()
+        self._invalidate_sat_cache()
         self._solver.push()
         return self._curr_frame_level
 
@@ -86,6 +103,7 @@ class SimStateSolver(SimStatePlugin):
             del self._path_constraints[self._curr_frame_level]
             del self._memory_constraints[self._curr_frame_level]
             self._curr_frame_level -= 1
+            self._invalidate_sat_cache()
             self._solver.pop()
             return self._curr_frame_level
 
@@ -102,9 +120,35 @@ class SimStateSolver(SimStatePlugin):
         Args:
             constraint: The constraint to add.
         """
+        if constraint in self._path_constraints[self._curr_frame_level]:
+            # already asserted
+            return
         self._path_constraints[self._curr_frame_level].add(constraint)
         self._add_assertion(constraint)
 
+    def add_path_constraints(self, constraints: List[BoolTerm]):
+        """
+        Add multiple path constraints to the state (at the current frame level), with a single call to the backend.
+        Args:
+            constraints: The constraints to add.
+        """
+        path_csts = self._path_constraints[self._curr_frame_level]
+        new_constraints = list()
+        for constraint in constraints:
+            if constraint not in path_csts:
+                path_csts.add(constraint)
+                new_constraints.append(constraint)
+        if new_constraints:
+            self._add_assertions(new_constraints)
+
+    def has_path_constraint(self, constraint: BoolTerm) -> bool:
+        """
+        Check if the constraint is already a path constraint of the state (at any frame level).
+        Args:
+            constraint: The constraint to check.
+        """
+        return any(constraint in path_csts for path_csts in self._path_constraints.values())
+
     def add_memory_constraint(self, constraint: BoolTerm):
         """
         Add a memory constraint to the state (at the current frame level).
@@ -157,6 +201,9 @@ class SimStateSolver(SimStatePlugin):
             frame: The frame level in the solver to check.
         """
         if not frame:
+            if self._curr_frame_level == 0:
+                # single frame, nothing to merge
+                return list(self._path_constraints[0])
             all_csts = [c_set for c_set in self._path_constraints.values()]
             return list(set().union(*all_csts))
         else:
@@ -170,6 +217,9 @@ class SimStateSolver(SimStatePlugin):
             frame: The frame level in the solver to check.
         """
         if not frame:
+            if self._curr_frame_level == 0:
+                # single frame, nothing to merge
+                return list(self._memory_constraints[0])
             all_csts = [c_set for c_set in self._memory_constraints.values()]
             return list(set().union(*all_csts))
         else:
@@ -182,6 +232,9 @@ class SimStateSolver(SimStatePlugin):
             frame: The frame level in the solver to check.
         """
         if not frame:
+            if self._curr_frame_level == 0:
+                # single frame, only merge path and memory constraints
+                return list(self._path_constraints[0].union(self._memory_constraints[0]))
             all_path_csts = [c_set for c_set in self._path_constraints.values()]
             all_mem_csts = [c_set for c_set in self._memory_constraints.values()]
             all_path_csts.extend(all_mem_csts)
@@ -201,10 +254,15 @@ class SimStateSolver(SimStatePlugin):
         constraints = self.constraints_at(frame)
         
         # we need to DFS through the constraints to find all the symbols
+        # (terms are hash-consed, so shared sub-terms are only visited once)
         queue = constraints.copy()
+        visited: Set[Term] = set()
         symbols: Dict[str, BVTerm] = {}
         while queue:
             constraint = queue.pop()
+            if constraint in visited:
+                continue
+            visited.add(constraint)
             if isinstance(constraint, BVTerm) and constraint.operator == "bvs":
                 # we found a symbol
                 # TODO this assumes implementation-specific knowledge (Yices2) (i.e., the name)
@@ -230,22 +288,30 @@ class SimStateSolver(SimStatePlugin):
     def is_sat(self) -> bool:
         """
         Check if the solver is in a satisfiable state.
+        The result is cached until the next change to the assertions.
         """
-        return self._solver.is_sat()
+        if self._is_sat is None:
+            self._is_sat = self._solver.is_sat()
+        return self._is_sat
 
     def is_unsat(self) -> bool:
         """
         Check if the solver is in an unsatisfiable state.
         """
-        return self._solver.is_unsat()
+        # QF_ABV is decidable: a completed check is either sat or unsat
+        return not self.is_sat()
 
     def is_formula_sat(self, formula: BoolTerm) -> bool:
         """
         Check if a formula is satisfiable given the current state of the solver.
+        Results are cached until the next change to the assertions.
         Args:
             formula: The formula to check.
         """
-        return self._solver.is_formula_sat(formula)
+        res = self._sat_cache.get(formula)
+        if res is None:
+            res = self._sat_cache[formula] = self._solver.is_formula_sat(formula)
+        return res
 
     def are_formulas_sat(self, terms: List[BoolTerm]) -> bool:
         """
@@ -261,7 +327,9 @@ class SimStateSolver(SimStatePlugin):
         Args:
             formula: The formula to check.
         """
-        return self._solver.is_formula_unsat(formula)
+        # QF_ABV is decidable: a completed check is either sat or unsat
+        # (an interrupted check raises SolverTimeout)
+        return not self.is_formula_sat(formula)
 
     def is_formula_true(self, formula: BoolTerm) -> bool:
         """
@@ -269,7 +337,7 @@ class SimStateSolver(SimStatePlugin):
         Args:
             formula: The formula to check.
         """
-        return self._solver.is_formula_true(formula)
+        return not self.is_formula_sat(Not(formula))
 
     def is_formula_false(self, formula: BoolTerm) -> bool:
         """
@@ -277,7 +345,7 @@ class SimStateSolver(SimStatePlugin):
         Args:
             formula: The formula to check.
         """
-        return self._solver.is_formula_false(formula)
+        return not self.is_formula_sat(formula)
 
     def eval(self, term, raw=False):
         """
@@ -342,15 +410,18 @@ class SimStateSolver(SimStatePlugin):
         new_solver._curr_frame_level = 0
         new_solver._path_constraints = dict()
         new_solver._memory_constraints = dict()
+        new_solver._sat_cache = dict()
+        new_solver._is_sat = None
 
         # Re-add all the constraints (Maybe one day Yices2 will do it for us with
         # a full Context clone, as of now this is the "cloning dei poveri".
         while True:
             level = new_solver._curr_frame_level
             new_solver._path_constraints[level] = set(self._path_constraints[level])
-            new_solver._add_assertions(new_solver._path_constraints[level])
             new_solver._memory_constraints[level] = set(self._memory_constraints[level])
-            new_solver._add_assertions(new_solver._memory_constraints[level])
+            # one batch per frame
+            new_solver._add_assertions(list(new_solver._path_constraints[level]) +
+                                       list(new_solver._memory_constraints[level]))
 
             if new_solver._curr_frame_level == self._curr_frame_level:
                 break
@@ -358,6 +429,10 @@ class SimStateSolver(SimStatePlugin):
                 # Add the next frame
                 new_solver.push()
 
+        # Same assertions, same results
+        new_solver._sat_cache = dict(self._sat_cache)
+        new_solver._is_sat = self._is_sat
+
         return new_solver
 
     def dump_smt2(self, filename: str):
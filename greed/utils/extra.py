@@ -1,10 +1,10 @@
+import itertools
+
+
 class UUIDGenerator(object):
     def __init__(self):
-        self.value = 0
-
-    def next(self):
-        self.value += 1
-        return self.value
+        # bind the counter directly (next() is called for every new state/memory/array)
+        self.next = itertools.count(1).__next__
 
 
 XID_GENERATOR = UUIDGenerator()
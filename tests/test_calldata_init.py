@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+import os
+
+import IPython
+import pytest
+
+from greed import Project
+from greed.solver.shortcuts import *
+
+if __package__:
+    from . import common
+else:
+    import common
+
+
+DEBUG = False
+
+
+def calldata_bytes(state, length):
+    # concrete bytes as ints, symbolic bytes as their symbol name
+    res = list()
+    for i in range(length):
+        cb = state.calldata[BVV(i, 256)]
+        res.append(bv_unsigned_value(cb) if is_concrete(cb) else cb.name)
+    return res
+
+
+def run_test(target_dir, debug=False):
+    p = Project(target_dir=target_dir)
+
+    def entry_state(calldata):
+        return p.factory.entry_state(xid=1, init_ctx={"CALLDATA": calldata})
+
+    # concrete CALLDATA
+    state = entry_state("0x11223344")
+    assert calldata_bytes(state, 4) == [0x11, 0x22, 0x33, 0x44]
+    assert state.solver.is_formula_true(BV_UGE(state.calldatasize, BVV(4, 256)))
+
+    # aligned symbolic byte
+    state = entry_state("0x11SS33")
+    assert calldata_bytes(state, 3) == [0x11, "CALLDATA_BYTE_1", 0x33]
+
+    # consecutive symbolic bytes
+    state = entry_state("0xSSSS22")
+    assert calldata_bytes(state, 3) == ["CALLDATA_BYTE_0", "CALLDATA_BYTE_1", 0x22]
+
+    # symbolic last byte
+    state = entry_state("0x1122SS")
+    assert calldata_bytes(state, 3) == [0x11, 0x22, "CALLDATA_BYTE_2"]
+    assert state.solver.is_formula_true(BV_UGE(state.calldatasize, BVV(3, 256)))
+
+    # a trailing single nibble is a byte on its own
+    state = entry_state("0x1122a")
+    assert calldata_bytes(state, 3) == [0x11, 0x22, 0x0a]
+    assert state.solver.is_formula_true(BV_UGE(state.calldatasize, BVV(3, 256)))
+
+    state = entry_state("0x11SSa")
+    assert calldata_bytes(state, 3) == [0x11, "CALLDATA_BYTE_1", 0x0a]
+
+    # misaligned symbolic markers are not valid hex
+    with pytest.raises(ValueError):
+        entry_state("0x1SS3")
+    with pytest.raises(ValueError):
+        entry_state("0x11S")
+
+    if debug:
+        IPython.embed()
+
+
+def test_calldata_init():
+    run_test(target_dir=f"{os.path.dirname(__file__)}/test_lambda_memory",
+             debug=DEBUG)
+
+
+if __name__ == "__main__":
+    common.setup_logging()
+    args = common.parse_args()
+
+    DEBUG = args.debug
+    test_calldata_init()
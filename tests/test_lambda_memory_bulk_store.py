@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+import os
+
+import IPython
+
+from greed import Project
+from greed.solver.shortcuts import *
+
+if __package__:
+    from . import common
+else:
+    import common
+
+
+DEBUG = False
+
+
+def read_all(state, memory):
+    # concrete values of the bytes (and the words) around the writes
+    values = [state.solver.eval(memory[BVV(i, 256)]) for i in range(104)]
+    values += [state.solver.eval(memory.readn(BVV(i, 256), BVV(32, 256))) for i in (0, 3, 16, 48, 56)]
+    return values
+
+
+def cached(memory):
+    return {width: dict(cache) for width, cache in memory.cache.items() if cache}
+
+
+def run_test(target_dir, debug=False):
+    p = Project(target_dir=target_dir)
+
+    state_bulk = p.factory.entry_state(xid=1)
+
+    # something in the caches that the writes must invalidate
+    state_bulk.memory[BVV(4, 256)] = BVV(0xee, 8)
+    state_bulk.memory.writen(BVV(0, 256), BVV(0x0102030405060708, 256), BVV(32, 256))
+    state_bulk.memory.writen(BVV(16, 256), BVV(0xff, 256), BVV(32, 256))
+    # (a word in the gap between the writes, it must stay cached)
+    state_bulk.memory.writen(BVV(56, 256), BVV(0xabcd, 256), BVV(32, 256))
+    state_loop = state_bulk.copy()
+
+    # overlapping and out-of-order indices (the last write wins)
+    writes = [(5, 0x01), (2, 0x02), (5, 0x03), (31, 0x04), (100, 0x09), (2, 0x05), (10, 0x06), (0, 0x07), (31, 0x08)]
+    writes = [(BVV(index, 256), BVV(value, 8)) for index, value in writes]
+
+    state_bulk.memory.bulk_store(writes)
+    for index, value in writes:
+        state_loop.memory[index] = value
+
+    assert state_bulk.memory.write_count == state_loop.memory.write_count
+    # same cache too: the bytes and words in the gaps between the written runs are still cached
+    assert cached(state_bulk.memory) == cached(state_loop.memory)
+    assert 4 in state_bulk.memory.cache[1] and 56 in state_bulk.memory.cache[32]
+    assert read_all(state_bulk, state_bulk.memory) == read_all(state_loop, state_loop.memory)
+
+    # same results without the caches (through the lambda constraints and the array stores)
+    state_bulk.memory.invalidate_cache()
+    state_loop.memory.invalidate_cache()
+    assert read_all(state_bulk, state_bulk.memory) == read_all(state_loop, state_loop.memory)
+
+    if debug:
+        IPython.embed()
+
+
+def test_lambda_memory_bulk_store():
+    run_test(target_dir=f"{os.path.dirname(__file__)}/test_lambda_memory",
+             debug=DEBUG)
+
+
+if __name__ == "__main__":
+    common.setup_logging()
+    args = common.parse_args()
+
+    DEBUG = args.debug
+    test_lambda_memory_bulk_store()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+import os
+
+import IPython
+
+from greed import Project
+from greed.sha3 import Sha3
+from greed.solver.shortcuts import *
+
+if __package__:
+    from . import common
+else:
+    import common
+
+
+DEBUG = False
+
+
+def check_read(state, memory, index, value):
+    # the read is served by the cache (if any), check its value in the solver of the state
+    assert state.solver.is_formula_true(Equal(memory[BVV(index, 256)], BVV(value, 8)))
+
+
+def check_readn(state, memory, index, value, n):
+    assert state.solver.is_formula_true(Equal(memory.readn(BVV(index, 256), BVV(n, 256)), BVV(value, n * 8)))
+
+
+def run_test(target_dir, debug=False):
+    p = Project(target_dir=target_dir)
+
+    state = p.factory.entry_state(xid=1)
+
+    # write in the child after copy(), the parent must not see it
+    state.memory[BVV(0x40, 256)] = BVV(0x11, 8)
+    child = state.copy()
+    assert child.memory.cache is state.memory.cache
+    check_read(state, state.memory, 0x40, 0x11)
+    check_read(child, child.memory, 0x40, 0x11)
+
+    child.memory[BVV(0x40, 256)] = BVV(0x22, 8)
+    assert child.memory.cache is not state.memory.cache
+    check_read(child, child.memory, 0x40, 0x22)
+    check_read(state, state.memory, 0x40, 0x11)
+
+    # the parent is now the only owner of the original cache, it is updated in place
+    parent_cache = state.memory.cache
+    state.memory[BVV(0x42, 256)] = BVV(0x99, 8)
+    assert state.memory.cache is parent_cache
+    check_read(state, state.memory, 0x42, 0x99)
+    check_read(child, child.memory, 0x42, 0x00)
+
+    # with more copies, only the last owner updates the shared cache in place
+    first = state.copy()
+    second = state.copy()
+    shared_cache = state.memory.cache
+    first.memory[BVV(0x43, 256)] = BVV(0x01, 8)
+    second.memory[BVV(0x43, 256)] = BVV(0x02, 8)
+    assert first.memory.cache is not shared_cache and second.memory.cache is not shared_cache
+    state.memory[BVV(0x43, 256)] = BVV(0x03, 8)
+    assert state.memory.cache is shared_cache
+    check_read(first, first.memory, 0x43, 0x01)
+    check_read(second, second.memory, 0x43, 0x02)
+    check_read(state, state.memory, 0x43, 0x03)
+
+    # write in the parent after copy(), the child must not see it
+    state.memory[BVV(0x41, 256)] = BVV(0x33, 8)
+    child = state.copy()
+    check_read(child, child.memory, 0x41, 0x33)
+
+    state.memory[BVV(0x41, 256)] = BVV(0x44, 8)
+    check_read(state, state.memory, 0x41, 0x44)
+    check_read(child, child.memory, 0x41, 0x33)
+
+    # same for the word cache (writen/readn)
+    state.memory.writen(BVV(0x80, 256), BVV(0xaa, 256), BVV(32, 256))
+    child = state.copy()
+    check_readn(child, child.memory, 0x80, 0xaa, 32)
+
+    child.memory.writen(BVV(0x80, 256), BVV(0xbb, 256), BVV(32, 256))
+    check_readn(child, child.memory, 0x80, 0xbb, 32)
+    check_readn(state, state.memory, 0x80, 0xaa, 32)
+
+    state.memory.writen(BVV(0x80, 256), BVV(0xcc, 256), BVV(32, 256))
+    check_readn(state, state.memory, 0x80, 0xcc, 32)
+    check_readn(child, child.memory, 0x80, 0xbb, 32)
+
+    # and for the SHA3 input buffers (copied along with the state)
+    sha = Sha3(state=state, memory=state.memory, start=BVV(0, 256), size=BVV(32, 256))
+    sha[BVV(0, 256)] = BVV(0x55, 8)
+    child = state.copy()
+    child_sha = sha.copy(new_state=child)
+    assert child_sha.cache is sha.cache
+
+    child_sha[BVV(0, 256)] = BVV(0x66, 8)
+    check_read(child, child_sha, 0, 0x66)
+    check_read(state, sha, 0, 0x55)
+
+    sha[BVV(1, 256)] = BVV(0x77, 8)
+    child_sha[BVV(1, 256)] = BVV(0x88, 8)
+    check_read(state, sha, 1, 0x77)
+    check_read(child, child_sha, 1, 0x88)
+
+    if debug:
+        IPython.embed()
+
+
+def test_lambda_memory_cache():
+    run_test(target_dir=f"{os.path.dirname(__file__)}/test_lambda_memory",
+             debug=DEBUG)
+
+
+if __name__ == "__main__":
+    common.setup_logging()
+    args = common.parse_args()
+
+    DEBUG = args.debug
+    test_lambda_memory_cache()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+import os
+
+import IPython
+
+from greed import Project, options
+from greed.exploration_techniques import Prioritizer
+from greed.utils.extra import gen_exec_id
+
+if __package__:
+    from . import common
+else:
+    import common
+
+
+DEBUG = False
+
+
+def explore(target_dir, search_strategy, technique=None, plug_after_deferred=False):
+    default_search_strategy = options.DEFAULT_SEARCH_STRATEGY
+    options.DEFAULT_SEARCH_STRATEGY = search_strategy
+    try:
+        p = Project(target_dir=target_dir)
+        simgr = p.factory.simgr(entry_state=p.factory.entry_state(xid=gen_exec_id()))
+        if technique is not None and not plug_after_deferred:
+            simgr.use_technique(technique)
+
+        max_deferred = 0
+        while simgr.active or not simgr._is_complete():
+            simgr.step()
+            max_deferred = max(max_deferred, len(simgr.stashes.get('deferred', [])))
+
+            if technique is not None and plug_after_deferred and len(simgr.stashes['deferred']) > 0:
+                # the technique takes over, the parked states are given back
+                parked = list(simgr.stashes['deferred'])
+                simgr.use_technique(technique)
+                assert len(simgr.stashes['deferred']) == 0
+                assert all(s in simgr.active for s in parked)
+                plug_after_deferred = False
+
+        assert not any(s.error for s in simgr.states), f"Simulation Manager has errored states: {simgr}"
+        return simgr, max_deferred
+    finally:
+        options.DEFAULT_SEARCH_STRATEGY = default_search_strategy
+
+
+def summary(simgr):
+    return sorted((s.pc, bool(s.revert)) for s in simgr.deadended)
+
+
+def run_test(target_dir, debug=False):
+    bfs_simgr, bfs_max_deferred = explore(target_dir, options.SEARCH_STRATEGY_BFS)
+    assert bfs_max_deferred == 0
+    assert bfs_simgr._default_search is None
+
+    # DFS without techniques: the default search parks the other states, and explores the same paths
+    dfs_simgr, dfs_max_deferred = explore(target_dir, options.SEARCH_STRATEGY_DFS)
+    assert dfs_max_deferred > 0
+    assert dfs_simgr._default_search is not None
+    assert summary(dfs_simgr) == summary(bfs_simgr)
+
+    # DFS with a plugged technique: the technique alone drives the exploration
+    scored = list()
+    def scoring_function(s):
+        scored.append(s)
+        return -s.uuid
+    prioritizer_simgr, _ = explore(target_dir, options.SEARCH_STRATEGY_DFS,
+                                   technique=Prioritizer(scoring_function=scoring_function))
+    assert prioritizer_simgr._default_search is None
+    assert prioritizer_simgr._techniques and len(scored) > 0
+    assert summary(prioritizer_simgr) == summary(bfs_simgr)
+
+    # DFS, then a technique plugged in the middle of the exploration
+    handoff_simgr, _ = explore(target_dir, options.SEARCH_STRATEGY_DFS,
+                               technique=Prioritizer(scoring_function=lambda s: -s.uuid), plug_after_deferred=True)
+    assert handoff_simgr._default_search is None
+    assert summary(handoff_simgr) == summary(bfs_simgr)
+
+    if debug:
+        IPython.embed()
+
+
+def test_search_strategy():
+    run_test(target_dir=f"{os.path.dirname(__file__)}/test_fork",
+             debug=DEBUG)
+
+
+if __name__ == "__main__":
+    common.setup_logging()
+    args = common.parse_args()
+
+    DEBUG = args.debug
+    test_search_strategy()
@@ -2,7 +2,9 @@ import pickle
 import os
 
 import yices
+from greed.solver.shortcuts import BVS, BVV, Equal, BV_UGT, BV_ULT
 from greed.solver.yices2 import Yices2, YicesTermBool
+from greed.state_plugins import SimStateSolver
 
 
 def test_serialize_deserialize_bvv():
@@ -254,6 +256,52 @@ def test_solver_multiple_frames():
         assert solver.is_formula_sat(formula_x_eq_150) == True
         assert solver.is_formula_sat(formula_x_eq_50) == False
 
+def test_state_solver_sat_cache():
+    # the is_sat/is_formula_sat results are cached until the assertions change,
+    # a stale answer would wrongly keep (or prune) a path
+    solver = SimStateSolver()
+    x = BVS("x", 256)
+
+    formula_x_eq_150 = Equal(x, BVV(150, 256))
+    formula_x_eq_250 = Equal(x, BVV(250, 256))
+
+    solver.add_path_constraints([BV_UGT(x, BVV(100, 256))])
+    assert solver.is_sat() == True
+    assert solver.is_formula_sat(formula_x_eq_150) == True
+    assert solver.is_formula_sat(formula_x_eq_250) == True
+
+    # new frame: the cached answers must not survive the push
+    solver.push()
+    assert solver.is_sat() == True
+    assert solver.is_formula_sat(formula_x_eq_150) == True
+
+    solver.add_path_constraints([BV_UGT(x, BVV(200, 256))])
+    assert solver.is_formula_sat(formula_x_eq_150) == False
+    assert solver.is_formula_sat(formula_x_eq_250) == True
+    assert solver.is_sat() == True
+
+    # make the current frame unsat
+    solver.add_path_constraints([BV_ULT(x, BVV(150, 256))])
+    assert solver.is_sat() == False
+    assert solver.is_unsat() == True
+    assert solver.is_formula_sat(formula_x_eq_250) == False
+
+    # back to the first frame (x > 100)
+    solver.pop()
+    assert solver.is_sat() == True
+    assert solver.is_formula_sat(formula_x_eq_150) == True
+    assert solver.is_formula_sat(formula_x_eq_250) == True
+
+    # re-adding a constraint that is already asserted does not change the answers
+    solver.add_path_constraints([BV_UGT(x, BVV(100, 256))])
+    assert solver.is_formula_sat(formula_x_eq_150) == True
+
+    # the copy starts with the same answers, and does not share the cache
+    new_solver = solver.copy()
+    new_solver.add_path_constraints([BV_UGT(x, BVV(200, 256))])
+    assert new_solver.is_formula_sat(formula_x_eq_150) == False
+    assert solver.is_formula_sat(formula_x_eq_150) == True
+
 
 resources_dir = os.path.join(os.path.dirname(__file__), os.path.basename(__file__).split('.')[0] + '_resources')
 os.makedirs(resources_dir, exist_ok=True)